@@ -1,17 +1,25 @@
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime, timedelta, timezone
+import io
 import logging
 
 from aiohttp import ClientSession
 import defusedxml.ElementTree as et
-from geopy import distance
 import voluptuous as vol
 
 from .constants import USER_AGENT
+from .ec_rate_limit import dd_weather_limiter
+from . import ec_sites
+from .ec_sites import closest_index
 
 AQHI_SITE_LIST_URL = "https://dd.weather.gc.ca/air_quality/doc/AQHI_XML_File_List.xml"
 AQHI_OBSERVATION_URL = "https://dd.weather.gc.ca/air_quality/aqhi/{}/observation/realtime/xml/AQ_OBS_{}_CURRENT.xml"
 AQHI_FORECAST_URL = "https://dd.weather.gc.ca/air_quality/aqhi/{}/forecast/realtime/xml/AQ_FCST_{}_CURRENT.xml"
 
+REGION_CACHE_EXPIRE_TIME = timedelta(hours=24)
+
+_region_cache = {}  # language -> (expiry, regions), as in CacheClientSession._cache
+
 LOG = logging.getLogger(__name__)
 
 ATTRIBUTION = {
@@ -31,22 +39,30 @@ def timestamp_to_datetime(timestamp):
 
 async def get_aqhi_regions(language):
     """Get list of all AQHI regions from Environment Canada, for auto-config."""
+    cached = _region_cache.get(language)
+    if cached and cached[0] > datetime.now():
+        LOG.debug("get_aqhi_regions() returning cached region list")
+        return cached[1]
+
     zone_name_tag = "name_%s_CA" % language.lower()
     region_name_tag = "name%s" % language.title()
 
     LOG.debug("get_aqhi_regions() started")
 
     regions = []
+    await dd_weather_limiter.acquire()
     async with ClientSession(raise_for_status=True) as session:
         response = await session.get(
             AQHI_SITE_LIST_URL, headers={"User-Agent": USER_AGENT}, timeout=10
         )
         result = await response.read()
 
-    site_xml = result.decode("utf-8")
-    xml_object = et.fromstring(site_xml)
+    # Stream-parse the zone list rather than materializing the full tree;
+    # each zone subtree is processed and then discarded
+    for _event, zone in et.iterparse(io.BytesIO(result)):
+        if zone.tag != "EC_administrativeZone":
+            continue
 
-    for zone in xml_object.findall("./EC_administrativeZone"):
         _zone_attribs = zone.attrib
         _zone_attrib = {
             "abbreviation": _zone_attribs["abreviation"],
@@ -61,14 +77,17 @@ async def get_aqhi_regions(language):
                 "latitude": float(_region_attribs["latitude"]),
                 "longitude": float(_region_attribs["longitude"]),
             }
-            _children = list(region)
-            for child in _children:
-                _region_attrib[child.tag] = child.text
+            _region_attrib.update((child.tag, child.text) for child in region)
             _region_attrib.update(_zone_attrib)
             regions.append(_region_attrib)
 
+        zone.clear()
+
     LOG.debug("get_aqhi_regions(): found %d regions", len(regions))
 
+    regions = ec_sites.from_meta(regions, "latitude", "longitude")
+
+    _region_cache[language] = (datetime.now() + REGION_CACHE_EXPIRE_TIME, regions)
     return regions
 
 
@@ -76,11 +95,9 @@ async def find_closest_region(language, lat, lon):
     """Return the AQHI region and site ID of the closest site."""
     region_list = await get_aqhi_regions(language)
 
-    def site_distance(site):
-        """Calculate distance to a region."""
-        return distance.distance((lat, lon), (site["latitude"], site["longitude"]))
-
-    return min(region_list, key=site_distance)
+    return region_list.meta[
+        closest_index(lat, lon, region_list.lats, region_list.lons)
+    ]
 
 
 class ECAirQuality(object):
@@ -135,26 +152,46 @@ class ECAirQuality(object):
             self.coordinates = kwargs["coordinates"]
 
         self.metadata = {"attribution": ATTRIBUTION[self.language]}
+        self._region_name_tag = "name{lang}".format(lang=self.language.title())
+        self._observation_url = None
+        self._forecast_url = None
+        self._xml_cache = {}  # url -> (validator headers, parsed tree)
         self.region_name = None
         self.current = None
         self.current_timestamp = None
         self.forecasts = dict(daily={}, hourly={})
 
     async def get_aqhi_data(self, url):
+        # The datamart files change rarely relative to our polling, so
+        # make the request conditional on the validators from the last
+        # fetch; a 304 skips both the download and the re-parse
+        headers = {"User-Agent": USER_AGENT}
+        cached = self._xml_cache.get(url)
+        if cached:
+            headers.update(cached[0])
+
+        await dd_weather_limiter.acquire()
         async with ClientSession(raise_for_status=True) as session:
             try:
-                response = await session.get(
-                    url.format(self.zone_id, self.region_id),
-                    headers={"User-Agent": USER_AGENT},
-                    timeout=10,
-                )
+                response = await session.get(url, headers=headers, timeout=10)
             except Exception:
                 LOG.debug("Retrieving AQHI failed", exc_info=True)
                 return None
 
+            if response.status == 304:
+                return cached[1]
+
             result = await response.read()
             aqhi_xml = result.decode("ISO-8859-1")
-            return et.fromstring(aqhi_xml)
+            xml_object = et.fromstring(aqhi_xml)
+
+            validators = {}
+            if response.headers.get("ETag"):
+                validators["If-None-Match"] = response.headers["ETag"]
+            if response.headers.get("Last-Modified"):
+                validators["If-Modified-Since"] = response.headers["Last-Modified"]
+            self._xml_cache[url] = (validators, xml_object)
+            return xml_object
 
     async def update(self):
         # Find closest site if not identified
@@ -169,15 +206,23 @@ class ECAirQuality(object):
                 self.region_id,
             )
 
-        # Fetch current measurement
-        aqhi_current = await self.get_aqhi_data(url=AQHI_OBSERVATION_URL)
+        if self._observation_url is None:
+            # The zone and region never change once resolved, so format once
+            self._observation_url = AQHI_OBSERVATION_URL.format(
+                self.zone_id, self.region_id
+            )
+            self._forecast_url = AQHI_FORECAST_URL.format(self.zone_id, self.region_id)
+
+        # Fetch current measurement and forecasts concurrently
+        aqhi_current, aqhi_forecast = await asyncio.gather(
+            self.get_aqhi_data(url=self._observation_url),
+            self.get_aqhi_data(url=self._forecast_url),
+        )
 
         if aqhi_current:
             # Update region name
             element = aqhi_current.find("region")
-            self.region_name = element.attrib[
-                "name{lang}".format(lang=self.language.title())
-            ]
+            self.region_name = element.attrib[self._region_name_tag]
             self.metadata["location"] = self.region_name
 
             # Update AQHI current condition
@@ -200,8 +245,6 @@ class ECAirQuality(object):
             )
 
         # Update AQHI forecasts
-        aqhi_forecast = await self.get_aqhi_data(url=AQHI_FORECAST_URL)
-
         if aqhi_forecast:
             # Update AQHI daily forecasts
             for f in aqhi_forecast.findall("./forecastGroup/forecast"):
@@ -1,23 +1,33 @@
 from aiohttp import ClientSession
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import heapq
+import itertools
 
 from .constants import USER_AGENT
 
 CACHE_EXPIRE_TIME = timedelta(minutes=200)  # Time is tuned for 3h radar image
+MAX_CACHE_ENTRIES = 128  # Enough for a few radar loops' worth of frames
 
 
 class CacheClientSession(ClientSession):
     """Shim to cache ClientSession requests."""
 
-    _cache = {}
+    _cache = OrderedDict()  # key -> (expiry, response), oldest use first
+    _expiry_heap = []  # (expiry, tiebreaker, key); may hold stale records
+    _heap_counter = itertools.count()
 
     def _flush_cache(self):
         """Flush expired cache entries."""
 
         now = datetime.now()
-        expired = [key for key, value in self._cache.items() if value[0] < now]
-        for key in expired:
-            del self._cache[key]
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            expiry, _, key = heapq.heappop(self._expiry_heap)
+            entry = self._cache.get(key)
+            # Only drop the entry if this heap record is still current;
+            # a refreshed key leaves its old record behind in the heap
+            if entry and entry[0] == expiry:
+                del self._cache[key]
 
     async def get(self, url, params, cache_time=CACHE_EXPIRE_TIME):
         """Thin wrapper around ClientSession.get to cache responses."""
@@ -26,13 +36,21 @@ class CacheClientSession(ClientSession):
 
         cache_key = (url, tuple(sorted(params.items())))
         result = self._cache.get(cache_key)
-        if not result:
+        if result:
+            self._cache.move_to_end(cache_key)
+        else:
+            expiry = datetime.now() + cache_time
             result = (
-                datetime.now() + cache_time,
+                expiry,
                 await super().get(
                     url=url, params=params, headers={"User-Agent": USER_AGENT}
                 ),
             )
             self._cache[cache_key] = result
+            heapq.heappush(
+                self._expiry_heap, (expiry, next(self._heap_counter), cache_key)
+            )
+            while len(self._cache) > MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
 
         return result[1]
@@ -165,9 +165,7 @@ async def get_historical_stations(
             headers={"User-Agent": USER_AGENT},
             timeout=10,
         )
-        result = await response.read()
-
-        station_html = result.decode("utf-8")
+        station_html = await response.text(encoding="utf-8")
         station_tree = lxml.html.fromstring(station_html)
         station_req_forms = station_tree.xpath(
             "//form[starts-with(@id, 'stnRequest') and '-sm' = substring(@id, string-length(@id) - string-length('-sm') +1)]"
@@ -176,17 +174,12 @@ async def get_historical_stations(
         stations = {}
         for station_req_form in station_req_forms:
             station = {}
-            station_name = station_req_form.xpath(
-                './/div[@class="col-md-10 col-sm-8 col-xs-8"]'
-            )[0].text
-            station["prov"] = station_req_form.xpath(
+            columns = station_req_form.xpath(
                 './/div[@class="col-md-10 col-sm-8 col-xs-8"]'
-            )[1].text
-            station["proximity"] = float(
-                station_req_form.xpath('.//div[@class="col-md-10 col-sm-8 col-xs-8"]')[
-                    2
-                ].text
             )
+            station_name = columns[0].text
+            station["prov"] = columns[1].text
+            station["proximity"] = float(columns[2].text)
             station["id"] = station_req_form.find(
                 "input[@name='StationID']"
             ).attrib.get("value")
@@ -283,9 +276,7 @@ class ECHistorical(object):
                 }
 
             else:
-                result = await response.read()
-
-                weather_xml = result.decode("utf-8")
+                weather_xml = await response.text(encoding="utf-8")
                 weather_tree = et.fromstring(weather_xml)
 
                 # Update metadata
@@ -1,34 +1,66 @@
 import csv
+from datetime import datetime, timedelta
+import functools
 import io
 
 from aiohttp import ClientSession
 from dateutil.parser import isoparse
-from geopy import distance
+import pandas as pd
 import voluptuous as vol
 
 from .constants import USER_AGENT
+from .ec_rate_limit import dd_weather_limiter
+from . import ec_sites
+from .ec_sites import closest_index
 
 SITE_LIST_URL = "https://dd.weather.gc.ca/hydrometric/doc/hydrometric_StationList.csv"
 READINGS_URL = "https://dd.weather.gc.ca/hydrometric/csv/{prov}/hourly/{prov}_{station}_hourly_hydrometric.csv"
 
+SITE_CACHE_EXPIRE_TIME = timedelta(hours=24)
+
+_site_cache = None  # (expiry, sites) tuple, as in CacheClientSession._cache
+
 
 __all__ = ["ECHydro"]
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_header(header_line):
+    """Split a bilingual datamart header line into column names.
+
+    The datamart headers are static, so the result is cached on the raw
+    line. Duplicate names (the repeating Grade/Symbol/QA qualifier
+    columns) get a numeric suffix since pandas requires unique names.
+    """
+    header = [h.split("/")[0].strip() for h in header_line.split(",")]
+    seen = {}
+    for i, name in enumerate(header):
+        if name in seen:
+            seen[name] += 1
+            header[i] = "{}.{}".format(name, seen[name])
+        else:
+            seen[name] = 0
+    return tuple(header)
+
+
 async def get_hydro_sites():
     """Get list of all sites from Environment Canada, for auto-config."""
+    global _site_cache
+
+    if _site_cache and _site_cache[0] > datetime.now():
+        return _site_cache[1]
 
     sites = []
 
+    await dd_weather_limiter.acquire()
     async with ClientSession(raise_for_status=True) as session:
         response = await session.get(
             SITE_LIST_URL, headers={"User-Agent": USER_AGENT}, timeout=10
         )
-        result = await response.read()
-    sites_csv_string = result.decode("utf-8-sig")
+        sites_csv_string = await response.text(encoding="utf-8-sig")
     sites_csv_stream = io.StringIO(sites_csv_string)
 
-    header = [h.split("/")[0].strip() for h in sites_csv_stream.readline().split(",")]
+    header = _parse_header(sites_csv_stream.readline())
     sites_reader = csv.DictReader(sites_csv_stream, fieldnames=header)
 
     for site in sites_reader:
@@ -38,6 +70,9 @@ async def get_hydro_sites():
             site["Longitude"] = float(site["Longitude"])
             sites.append(site)
 
+    sites = ec_sites.from_meta(sites, "Latitude", "Longitude")
+
+    _site_cache = (datetime.now() + SITE_CACHE_EXPIRE_TIME, sites)
     return sites
 
 
@@ -45,13 +80,7 @@ async def closest_site(lat, lon):
     """Return the province/site_code of the closest station to our lat/lon."""
     site_list = await get_hydro_sites()
 
-    def site_distance(site):
-        """Calculate distance to a site."""
-        return distance.distance((lat, lon), (site["Latitude"], site["Longitude"]))
-
-    closest = min(site_list, key=site_distance)
-
-    return closest
+    return site_list.meta[closest_index(lat, lon, site_list.lats, site_list.lons)]
 
 
 class ECHydro(object):
@@ -88,6 +117,7 @@ class ECHydro(object):
         self.measurements = {}
         self.timestamp = None
         self.location = None
+        self._readings_url = None
 
         if (
             "province" in kwargs
@@ -115,24 +145,31 @@ class ECHydro(object):
 
         # Get hydrometric data
 
+        if self._readings_url is None:
+            # The station never changes once resolved, so format once
+            self._readings_url = READINGS_URL.format(
+                prov=self.province, station=self.station
+            )
+
+        await dd_weather_limiter.acquire()
         async with ClientSession(raise_for_status=True) as session:
             response = await session.get(
-                READINGS_URL.format(prov=self.province, station=self.station),
+                self._readings_url,
                 headers={"User-Agent": USER_AGENT},
                 timeout=10,
             )
-            result = await response.read()
-        hydro_csv_string = result.decode("utf-8-sig")
+            hydro_csv_string = await response.text(encoding="utf-8-sig")
         hydro_csv_stream = io.StringIO(hydro_csv_string)
 
-        header = [
-            h.split("/")[0].strip() for h in hydro_csv_stream.readline().split(",")
-        ]
-        readings_reader = csv.DictReader(hydro_csv_stream, fieldnames=header)
+        header = _parse_header(hydro_csv_stream.readline())
+
+        # Parse in C via pandas and only ever look at the newest reading
+        readings = pd.read_csv(
+            hydro_csv_stream, header=None, names=header, dtype=str, na_filter=False
+        )
 
-        readings = [r for r in readings_reader]
         if len(readings) > 0:
-            latest = readings[-1]
+            latest = readings.iloc[-1]
 
             if latest["Water Level"] != "":
                 self.measurements["water_level"] = {
@@ -148,4 +185,4 @@ class ECHydro(object):
                     "unit": "m³/s",
                 }
 
-            self.timestamp = isoparse(readings[-1]["Date"])
+            self.timestamp = isoparse(latest["Date"])
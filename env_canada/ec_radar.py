@@ -1,4 +1,4 @@
-from aiohttp.client_exceptions import ClientConnectorError
+from aiohttp.client_exceptions import ClientConnectorError, ClientResponseError
 import asyncio
 import datetime
 from io import BytesIO
@@ -76,6 +76,34 @@ timestamp_label = {
 }
 
 
+class _AIMDLimiter:
+    """Adaptive bound on concurrent GeoMet frame fetches.
+
+    Additive increase once per fully successful frame loop,
+    multiplicative decrease on throttling (429) or a 5xx, so frame
+    loops back off while the server is struggling and ramp back up
+    gradually once it recovers.
+    """
+
+    def __init__(self, initial=8, minimum=2, maximum=16):
+        self._minimum = minimum
+        self._maximum = maximum
+        self.limit = initial
+
+    def semaphore(self):
+        """Return a semaphore sized to the current limit."""
+        return asyncio.Semaphore(self.limit)
+
+    def success(self):
+        self.limit = min(self._maximum, self.limit + 1)
+
+    def server_error(self):
+        self.limit = max(self._minimum, self.limit // 2)
+
+
+_frame_fetch_limiter = _AIMDLimiter()
+
+
 def compute_bounding_box(distance, latittude, longitude):
     """
     Modified from https://gist.github.com/alexcpn/f95ae83a7ee0293a5225
@@ -189,57 +217,51 @@ class ECRadar(object):
         else:
             self.layer_key = "snow"
 
-    async def _get_basemap(self):
+    async def _get_basemap(self, session):
         """Fetch the background map image."""
         basemap_params.update(self.map_params)
 
         try:
-            async with ClientSession(raise_for_status=True) as session:
-                response = await session.get(url=basemap_url, params=basemap_params)
-                base_bytes = await response.read()
-                self.map_image = Image.open(BytesIO(base_bytes)).convert("RGBA")
+            response = await session.get(url=basemap_url, params=basemap_params)
+            base_bytes = await response.read()
+            self.map_image = Image.open(BytesIO(base_bytes)).convert("RGBA")
 
         except ClientConnectorError:
             logging.warning("NRCan base map could not be retreived")
 
             try:
-                async with ClientSession(raise_for_status=True) as session:
-                    response = await session.get(
-                        url=backup_map_url, params=basemap_params
-                    )
-                    base_bytes = await response.read()
-                    self.map_image = Image.open(BytesIO(base_bytes)).convert("RGBA")
+                response = await session.get(url=backup_map_url, params=basemap_params)
+                base_bytes = await response.read()
+                self.map_image = Image.open(BytesIO(base_bytes)).convert("RGBA")
             except ClientConnectorError:
                 logging.warning("Mapbox base map could not be retreived")
 
         return
 
-    async def _get_legend(self):
+    async def _get_legend(self, session):
         """Fetch legend image."""
         legend_params.update(
             dict(
                 layer=precip_layers[self.layer_key], style=legend_style[self.layer_key]
             )
         )
-        async with ClientSession(raise_for_status=True) as session:
-            response = await session.get(url=geomet_url, params=legend_params)
-            legend_bytes = await response.read()
+        response = await session.get(url=geomet_url, params=legend_params)
+        legend_bytes = await response.read()
         self.legend_image = Image.open(BytesIO(legend_bytes)).convert("RGB")
         legend_width = self.legend_image.size[0]
         self.legend_position = (self.width - legend_width, 0)
         self.legend_layer = self.layer_key
 
-    async def _get_dimensions(self):
+    async def _get_dimensions(self, session):
         """Get time range of available data."""
         capabilities_params["layer"] = precip_layers[self.layer_key]
 
-        async with ClientSession(raise_for_status=True) as session:
-            response = await session.get(
-                url=geomet_url,
-                params=capabilities_params,
-                cache_time=datetime.timedelta(minutes=5),
-            )
-            capabilities_xml = await response.text()
+        response = await session.get(
+            url=geomet_url,
+            params=capabilities_params,
+            cache_time=datetime.timedelta(minutes=5),
+        )
+        capabilities_xml = await response.text()
 
         capabilities_tree = et.fromstring(capabilities_xml)
         dimension_string = capabilities_tree.find(
@@ -252,7 +274,7 @@ class ECRadar(object):
         self.timestamp = end.isoformat()
         return start, end
 
-    async def _combine_layers(self, radar_bytes, frame_time):
+    async def _combine_layers(self, session, radar_bytes, frame_time):
         """Add radar overlay to base layer and add timestamp."""
 
         radar = Image.open(BytesIO(radar_bytes)).convert("RGBA")
@@ -268,7 +290,7 @@ class ECRadar(object):
         # Overlay radar on basemap
 
         if not self.map_image:
-            await self._get_basemap()
+            await self._get_basemap(session)
         if self.map_image:
             frame = Image.alpha_composite(self.map_image, radar)
         else:
@@ -278,7 +300,7 @@ class ECRadar(object):
 
         if self.show_legend:
             if not self.legend_image or self.legend_layer != self.layer_key:
-                await self._get_legend()
+                await self._get_legend(session)
             frame.paste(self.legend_image, self.legend_position)
 
         # Add timestamp
@@ -304,23 +326,34 @@ class ECRadar(object):
 
         return frame_bytes
 
-    async def _get_radar_image(self, session, frame_time):
+    async def _get_radar_image(self, session, frame_time, semaphore=None):
         params = dict(
             **radar_params,
             **self.map_params,
             layers=precip_layers[self.layer_key],
             time=frame_time.strftime("%Y-%m-%dT%H:%M:00Z")
         )
-        response = await session.get(url=geomet_url, params=params)
-        return await response.read()
+        try:
+            if semaphore:
+                async with semaphore:
+                    response = await session.get(url=geomet_url, params=params)
+                    frame = await response.read()
+            else:
+                response = await session.get(url=geomet_url, params=params)
+                frame = await response.read()
+        except ClientResponseError as err:
+            if err.status == 429 or err.status >= 500:
+                _frame_fetch_limiter.server_error()
+            raise
+        return frame
 
     async def get_latest_frame(self):
         """Get the latest image from Environment Canada."""
-        dimensions = await self._get_dimensions()
-        latest = dimensions[1]
         async with ClientSession(raise_for_status=True) as session:
+            dimensions = await self._get_dimensions(session)
+            latest = dimensions[1]
             frame = await self._get_radar_image(session=session, frame_time=latest)
-        return await self._combine_layers(frame, latest)
+            return await self._combine_layers(session, frame, latest)
 
     async def update(self):
         if self.precip_type == "auto":
@@ -331,29 +364,37 @@ class ECRadar(object):
     async def get_loop(self, fps=5):
         """Build an animated GIF of recent radar images."""
 
-        """Build list of frame timestamps."""
-        start, end = await self._get_dimensions()
-        frame_times = [start]
-
-        while True:
-            next_frame = frame_times[-1] + datetime.timedelta(minutes=radar_interval)
-            if next_frame > end:
-                break
-            else:
-                frame_times.append(next_frame)
-
-        """Fetch frames."""
-
-        tasks = []
         async with ClientSession(raise_for_status=True) as session:
+            """Build list of frame timestamps."""
+            start, end = await self._get_dimensions(session)
+            frame_times = [start]
+
+            while True:
+                next_frame = frame_times[-1] + datetime.timedelta(
+                    minutes=radar_interval
+                )
+                if next_frame > end:
+                    break
+                else:
+                    frame_times.append(next_frame)
+
+            """Fetch frames."""
+
+            tasks = []
+            semaphore = _frame_fetch_limiter.semaphore()
             for t in frame_times:
-                tasks.append(self._get_radar_image(session=session, frame_time=t))
+                tasks.append(
+                    self._get_radar_image(
+                        session=session, frame_time=t, semaphore=semaphore
+                    )
+                )
             radar_layers = await asyncio.gather(*tasks)
+            _frame_fetch_limiter.success()
 
-        frames = []
+            frames = []
 
-        for i, f in enumerate(radar_layers):
-            frames.append(await self._combine_layers(f, frame_times[i]))
+            for i, f in enumerate(radar_layers):
+                frames.append(await self._combine_layers(session, f, frame_times[i]))
 
         for f in range(3):
             frames.append(frames[-1])
@@ -0,0 +1,39 @@
+import asyncio
+from time import monotonic
+
+__all__ = ["TokenBucket", "dd_weather_limiter"]
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for polite client-side throttling."""
+
+    def __init__(self, rate, capacity):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+
+    async def acquire(self):
+        """Wait until a request token is available.
+
+        No lock is held: the token accounting between awaits is atomic
+        within an event loop, and each waiter re-checks the balance
+        after sleeping. This also keeps the shared bucket free of
+        loop-bound primitives, so it survives repeated asyncio.run
+        calls.
+        """
+        while True:
+            now = monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+# Shared limiter for dd.weather.gc.ca; allows short bursts while keeping the
+# sustained request rate modest
+dd_weather_limiter = TokenBucket(rate=2, capacity=8)
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+__all__ = ["Sites", "closest_index"]
+
+
+@dataclass
+class Sites:
+    """Site table in struct-of-arrays form.
+
+    Coordinates live in parallel float64 arrays for the vectorized
+    distance kernel; per-site metadata dicts are only touched at the
+    final argmin index.
+    """
+
+    lats: np.ndarray
+    lons: np.ndarray
+    meta: list
+
+    def __len__(self):
+        return len(self.meta)
+
+
+def from_meta(meta, lat_key, lon_key):
+    """Build a Sites table from parsed per-site metadata dicts."""
+    lats = np.fromiter((m[lat_key] for m in meta), dtype=np.float64, count=len(meta))
+    lons = np.fromiter((m[lon_key] for m in meta), dtype=np.float64, count=len(meta))
+    return Sites(lats=lats, lons=lons, meta=meta)
+
+
+def closest_index(lat, lon, lats, lons):
+    """Return the index of the closest site to lat/lon.
+
+    Computes a vectorized haversine over the site coordinate arrays.
+    The angular distance is monotonic in the haversine term itself, so
+    the arctan/sqrt back-transform (and the Earth radius) are omitted
+    and the argmin is taken directly.
+    """
+    phi1 = np.radians(lat)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return int(np.argmin(a))
@@ -1,3 +1,4 @@
+import asyncio
 import csv
 import datetime
 import logging
@@ -6,16 +7,22 @@ import re
 from aiohttp import ClientSession
 from dateutil import parser, relativedelta, tz
 import defusedxml.ElementTree as et
-from geopy import distance
 import voluptuous as vol
 
 from . import ec_exc
 from .constants import USER_AGENT
+from .ec_rate_limit import dd_weather_limiter
+from . import ec_sites
+from .ec_sites import closest_index
 
 SITE_LIST_URL = "https://dd.weather.gc.ca/citypage_weather/docs/site_list_en.csv"
 
 WEATHER_URL = "https://dd.weather.gc.ca/citypage_weather/xml/{}_{}.xml"
 
+SITE_CACHE_EXPIRE_TIME = datetime.timedelta(hours=24)
+
+_site_cache = None  # (expiry, sites) tuple, as in CacheClientSession._cache
+
 LOG = logging.getLogger(__name__)
 
 ATTRIBUTION = {
@@ -217,6 +224,11 @@ alerts_meta = {
     },
 }
 
+# Compile the alert title patterns once at import rather than on every update
+for _category in alerts_meta.values():
+    for _lang in ("english", "french"):
+        _category[_lang]["compiled"] = re.compile(_category[_lang]["pattern"])
+
 metadata_meta = {
     "timestamp": {"xpath": "./currentConditions/dateTime/timeStamp"},
     "location": {"xpath": "./location/name"},
@@ -239,9 +251,16 @@ def parse_timestamp(t):
 
 async def get_ec_sites():
     """Get list of all sites from Environment Canada, for auto-config."""
+    global _site_cache
+
+    if _site_cache and _site_cache[0] > datetime.datetime.now():
+        LOG.debug("get_ec_sites() returning cached site list")
+        return _site_cache[1]
+
     LOG.debug("get_ec_sites() started")
     sites = []
 
+    await dd_weather_limiter.acquire()
     async with ClientSession(raise_for_status=True) as session:
         response = await session.get(
             SITE_LIST_URL, headers={"User-Agent": USER_AGENT}, timeout=10
@@ -256,18 +275,18 @@ async def get_ec_sites():
             site["Longitude"] = -1 * float(site["Longitude"].replace("W", ""))
             sites.append(site)
 
+    sites = ec_sites.from_meta(sites, "Latitude", "Longitude")
+
     LOG.debug("get_ec_sites() done, retrieved %d sites", len(sites))
+    _site_cache = (datetime.datetime.now() + SITE_CACHE_EXPIRE_TIME, sites)
     return sites
 
 
 def closest_site(site_list, lat, lon):
     """Return the province/site_code of the closest station to our lat/lon."""
-
-    def site_distance(site):
-        """Calculate distance to a site."""
-        return distance.distance((lat, lon), (site["Latitude"], site["Longitude"]))
-
-    closest = min(site_list, key=site_distance)
+    closest = site_list.meta[
+        closest_index(lat, lon, site_list.lats, site_list.lons)
+    ]
 
     return "{}/{}".format(closest["Province Codes"], closest["Codes"])
 
@@ -307,12 +326,25 @@ class ECWeather(object):
         self.language = kwargs["language"]
         self.max_data_age = kwargs["max_data_age"]
         self.metadata = {"attribution": ATTRIBUTION[self.language]}
+
+        # Resolve the language branch of the meta tables once; update()
+        # then indexes these directly instead of branching per field
+        self._condition_labels = {
+            c: meta[self.language] for c, meta in conditions_meta.items()
+        }
+        self._alerts_meta = {
+            category: meta[self.language] for category, meta in alerts_meta.items()
+        }
+        self._summary_label = summary_meta["label"][self.language]
+
         self.conditions = {}
         self.alerts = {}
         self.daily_forecasts = []
         self.hourly_forecasts = []
         self.forecast_time = ""
         self.site_list = []
+        self._weather_url = None
+        self._update_task = None
 
         if "station_id" in kwargs and kwargs["station_id"] is not None:
             self.station_id = kwargs["station_id"]
@@ -323,23 +355,63 @@ class ECWeather(object):
             self.lat = kwargs["coordinates"][0]
             self.lon = kwargs["coordinates"][1]
 
+    async def _fetch_weather_xml(self):
+        """Fetch the raw weather XML for our station."""
+        if self._weather_url is None:
+            # The station ID and language never change, so format once
+            self._weather_url = WEATHER_URL.format(self.station_id, self.language[0])
+
+        await dd_weather_limiter.acquire()
+        async with ClientSession(raise_for_status=True) as session:
+            response = await session.get(
+                self._weather_url,
+                headers={"User-Agent": USER_AGENT},
+                timeout=10,
+            )
+            return await response.text(encoding="utf-8")
+
     async def update(self):
-        """Get the latest data from Environment Canada."""
+        """Get the latest data from Environment Canada.
+
+        Concurrent callers share the refresh already in flight instead
+        of issuing duplicate requests for the same data.
+        """
+        if self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.ensure_future(self._update())
+        await asyncio.shield(self._update_task)
+
+    async def _update(self):
+        """Fetch and parse the latest data."""
+
+        weather_xml = None
 
         # Determine station ID or coordinates if not provided
         if not self.site_list:
-            self.site_list = await get_ec_sites()
             if self.station_id:
+                # The site list is only needed to resolve our coordinates,
+                # so it can be fetched concurrently with the weather data.
+                # Exceptions are collected so an unknown station ID still
+                # raises UnknownStationId rather than the fetch error its
+                # 404 produces
+                site_list, weather_xml = await asyncio.gather(
+                    get_ec_sites(), self._fetch_weather_xml(), return_exceptions=True
+                )
+                if isinstance(site_list, BaseException):
+                    raise site_list
+                self.site_list = site_list
                 stn = self.station_id.split("/")
                 if len(stn) == 2:
-                    for site in self.site_list:
+                    for site in self.site_list.meta:
                         if stn[1] == site["Codes"] and stn[0] == site["Province Codes"]:
                             self.lat = site["Latitude"]
                             self.lon = site["Longitude"]
                             break
                 if not self.lat:
                     raise ec_exc.UnknownStationId
+                if isinstance(weather_xml, BaseException):
+                    raise weather_xml
             else:
+                self.site_list = await get_ec_sites()
                 self.station_id = closest_site(self.site_list, self.lat, self.lon)
                 if not self.station_id:
                     raise ec_exc.UnknownStationId
@@ -349,14 +421,8 @@ class ECWeather(object):
         )
 
         # Get weather data
-        async with ClientSession(raise_for_status=True) as session:
-            response = await session.get(
-                WEATHER_URL.format(self.station_id, self.language[0]),
-                headers={"User-Agent": USER_AGENT},
-                timeout=10,
-            )
-            result = await response.read()
-        weather_xml = result.decode()
+        if weather_xml is None:
+            weather_xml = await self._fetch_weather_xml()
 
         try:
             weather_tree = et.fromstring(weather_xml)
@@ -420,7 +486,7 @@ class ECWeather(object):
 
         # Update current conditions
         for c, meta in conditions_meta.items():
-            self.conditions[c] = {"label": meta[self.language]}
+            self.conditions[c] = {"label": self._condition_labels[c]}
             self.conditions[c].update(get_condition(meta))
 
         # Update text summary
@@ -428,20 +494,20 @@ class ECWeather(object):
         summary = get_condition(summary_meta["text_summary"])["value"]
 
         self.conditions["text_summary"] = {
-            "label": summary_meta["label"][self.language],
+            "label": self._summary_label,
             "value": ". ".join([period, summary]),
         }
 
         # Update alerts
-        for category, meta in alerts_meta.items():
-            self.alerts[category] = {"value": [], "label": meta[self.language]["label"]}
+        for category, meta in self._alerts_meta.items():
+            self.alerts[category] = {"value": [], "label": meta["label"]}
 
         alert_elements = weather_tree.findall("./warnings/event")
 
         for a in alert_elements:
             title = a.attrib.get("description").strip()
-            for category, meta in alerts_meta.items():
-                category_match = re.search(meta[self.language]["pattern"], title)
+            for category, meta in self._alerts_meta.items():
+                category_match = meta["compiled"].search(title)
                 if category_match:
                     alert = {
                         "title": title.title(),
@@ -18,9 +18,9 @@ setuptools.setup(
     install_requires=[
         "aiohttp",
         "defusedxml",
-        "geopy",
         "imageio",
         "lxml",
+        "numpy>=1.22.2",
         "pandas>=1.3.0",
         "Pillow",
         "python-dateutil",
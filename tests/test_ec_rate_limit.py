@@ -0,0 +1,20 @@
+import asyncio
+from time import monotonic
+
+from env_canada.ec_rate_limit import TokenBucket
+
+
+def test_burst_then_throttle():
+    bucket = TokenBucket(rate=100, capacity=2)
+
+    async def drain():
+        for _ in range(5):
+            await bucket.acquire()
+
+    start = monotonic()
+    asyncio.run(drain())
+    elapsed = monotonic() - start
+
+    # Two requests ride the burst capacity; the remaining three wait
+    # for refills at 100 tokens/s
+    assert elapsed > 0.02
@@ -0,0 +1,23 @@
+import numpy as np
+
+from env_canada import ec_sites
+
+
+def test_closest_index():
+    # Ottawa, Toronto, Vancouver
+    lats = np.asarray([45.42, 43.65, 49.28])
+    lons = np.asarray([-75.69, -79.38, -123.12])
+
+    assert ec_sites.closest_index(45.5, -73.57, lats, lons) == 0
+    assert ec_sites.closest_index(43.26, -79.87, lats, lons) == 1
+    assert ec_sites.closest_index(48.43, -123.37, lats, lons) == 2
+
+
+def test_from_meta():
+    meta = [{"lat": 45.42, "lon": -75.69}, {"lat": 49.28, "lon": -123.12}]
+    sites = ec_sites.from_meta(meta, "lat", "lon")
+
+    assert len(sites) == 2
+    assert sites.lats.tolist() == [45.42, 49.28]
+    assert sites.lons.tolist() == [-75.69, -123.12]
+    assert sites.meta[1]["lat"] == 49.28